@@ -11,7 +11,13 @@ Raspberry Pi with I2C or serial implmentation and bidirectional level shifters.
 PC with serial implementation and a USB-to-UART cable (5V TTL).
 
 """
+import asyncio
+import struct
+import types
 import warnings
+from time import monotonic, sleep
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from .stepper_base import StepperBase
 try:  # Import I2C module
     from smbus2 import SMBus, i2c_msg
@@ -25,9 +31,18 @@ except ImportError:
 # pylint: disable=invalid-name
 
 # ---------------------------------------CONSTANTS-----------------------------------------------
-_MAX_RESP_BITS = 8
 _OBJECT_TYPE = "TicStage"
 
+# Command and variable map entries; tuple-indexable for backward
+# compatibility, attribute-addressable for readability.
+Cmd = namedtuple('Cmd', ['addr', 'proto'])
+Var = namedtuple('Var', ['addr', 'size'])
+
+# Decoded single-transaction view of the commonly polled variables
+Snapshot = namedtuple('Snapshot', ['operation_state', 'misc_flags1',
+                                   'error_status', 'curr_position',
+                                   'curr_velocity'])
+
 # Uses bit flags
 _error_status_dict = {
         0: "Intentionally de-energized",
@@ -57,6 +72,13 @@ _op_state_dict = {
         8: "Starting up",
         10: "Normal"}
 
+# (mask, name) pairs precomputed from the bit-flag dicts above
+_misc_bits = [(1 << i, name) for i, name in _misc_bit_dict.items()]
+_error_bits = [(1 << i, name) for i, name in _error_status_dict.items()]
+
+# Compiled once so 32-bit encodes skip re-parsing the format string
+_pack_u32 = struct.Struct('<I')
+
 
 class TicStepper(StepperBase):
     """Base class for Pololu Tic stepper driver.
@@ -75,6 +97,8 @@ class TicStepper(StepperBase):
         Number of steps per revolution.
     input_rpm : float
         Initial max speed in revolutions per minute.
+    serial_timeout : float
+        (Serial) Upper bound in seconds on waiting for a reply.
 
     Attributes
     ----------
@@ -96,16 +120,31 @@ class TicStepper(StepperBase):
                  address=None,
                  input_dist_per_rev=1,
                  input_steps_per_rev=200,
-                 input_rpm=1):
+                 input_rpm=1,
+                 serial_timeout=0.1):
 
-        if self._comProtocol(com_type) == self._com_protocol['SERIAL']:
+        protocol = self._comProtocol(com_type)
+        if protocol == self._com_protocol['SERIAL']:
             port_name = port_params[0]  # ex: '/dev/ttyUSB0'
             baud_rate = port_params[1]  # ex: 9600
-            self.com = TicSerial(port_name, baud_rate, address)
+            self.com = TicSerial(port_name, baud_rate, address,
+                                 timeout=serial_timeout)
 
-        elif self._comProtocol(com_type) == self._com_protocol['I2C']:
+        elif protocol == self._com_protocol['I2C']:
             self.com = TicI2C(port_params, address)
-        self.com.send(self._command_dict['rst'])
+
+        # Bind every command and variable map entry once so each method
+        # pays a single attribute load instead of a two-level dict lookup
+        # (key hash + class-attr get) per call.
+        for name, entry in self._command_dict.items():
+            setattr(self, '_cmd_' + name, entry)
+        for name, entry in self._variable_dict.items():
+            setattr(self, '_var_' + name, entry)
+        self._limit_switch_cache = {}
+        self._state_cache = None
+        self._state_ts = 0.0
+
+        self.com.send(self._cmd_rst)
         super(TicStepper, self).__init__(input_dist_per_rev,
                                          input_steps_per_rev,
                                          input_rpm)
@@ -115,48 +154,59 @@ class TicStepper(StepperBase):
 
     @property
     def accel_decel(self) -> list:
-        """Acceleration and deceleration values."""
-        curr_accel = self.com.send(self._command_dict['gVariable'],
-                                   self._variable_dict['max_accel'])
-        curr_decel = self.com.send(self._command_dict['gVariable'],
-                                   self._variable_dict['max_decel'])
-        int_accel = self.bytesToInt(curr_accel)
-        int_decel = self.bytesToInt(curr_decel)
+        """Acceleration and deceleration values.
+
+        `max_decel` and `max_accel` are adjacent in the Tic variable map, so
+        both are fetched with a single 8-byte block read.
+        """
+        raw = self._readBlock(self._var_max_decel.addr, 8)
+        int_decel = self.bytesToInt(raw[:4])
+        int_accel = self.bytesToInt(raw[4:8])
         return [int_accel, int_decel]
 
     @accel_decel.setter
     def accel_decel(self, accel_decel_vals: list):
         if accel_decel_vals[0] > 0 and accel_decel_vals[1] > 0:
-            accel = accel_decel_vals[0]
-            decel = accel_decel_vals[1]
-            self._setAccel(accel)
-            self._setDecel(decel)
+            accel = int(accel_decel_vals[0])
+            decel = int(accel_decel_vals[1])
+            self.com.send_batch([(self._cmd_sMaxAccel, accel),
+                                 (self._cmd_sMaxDecel, decel)])
         else:
             warnings.warn("Acceleration and/or deceleration must be > 0")
 
     @staticmethod
     def bytesToInt(b: list) -> int:
-        """Convert 16- or 32-bit output to int."""
-        val = b[0] + (b[1] << 8)
-        try:
-            val = val + (b[2] << 16) + (b[3] << 24)
-        finally:
-            return val
+        """Convert little-endian 8- to 32-bit output to unsigned int."""
+        return int.from_bytes(bytes(b), 'little')
+
+    @staticmethod
+    def bytesToSignedInt(b: list) -> int:
+        """Convert little-endian 8- to 32-bit output to signed int."""
+        return int.from_bytes(bytes(b), 'little', signed=True)
 
     def checkLimitSwitch(self, direction: str) -> bool:
-        """Confirm that limit switch exists in homing direction `direction`."""
-        command_to_send = self._command_dict['gSetting']
-        if direction == 'fwd':
-            data = self._setting_dict['limit_switch_fwd']
-        elif direction == 'rev':
-            data = self._setting_dict['limit_switch_rev']
-        else:
+        """Confirm that limit switch exists in homing direction `direction`.
+
+        Limit switch settings can only change over USB, so the first read
+        per direction is cached and later calls (e.g. every `home`) cost no
+        bus traffic. Call `refreshLimitSwitches` after reconfiguring.
+        """
+        if direction in self._limit_switch_cache:
+            return self._limit_switch_cache[direction]
+        if direction not in ('fwd', 'rev'):
             warnings.warn('Direction should be `fwd` or `rev`')
             return False
-        limit_switch = self.com.send(command_to_send, data)
-        if limit_switch == 0:
-            return False
-        return True
+        # The two settings bytes are adjacent, so one two-byte read fills
+        # the cache for both directions at once.
+        raw = self.com.send(self._cmd_gSetting,
+                            (self._setting_dict['limit_switch_fwd'].addr, 2))
+        self._limit_switch_cache['fwd'] = raw[0] != 0
+        self._limit_switch_cache['rev'] = raw[1] != 0
+        return self._limit_switch_cache[direction]
+
+    def refreshLimitSwitches(self):
+        """Drop cached limit switch reads after a USB reconfiguration."""
+        self._limit_switch_cache.clear()
 
     @property
     def enable(self):
@@ -183,21 +233,37 @@ class TicStepper(StepperBase):
         """
         if state == self._enable_states['DISABLED']:
             self._enable = self._enable_states['DISABLED']
-            self.com.send(self._command_dict['enterSafeStart'])
-            self.com.send(self._command_dict['deenergize'])
+            sequence = self._DISABLE_SEQ
         elif state == self._enable_states['ENABLED']:
             self._enable = self._enable_states['ENABLED']
-            self.com.send(self._command_dict['energize'])
-            self.com.send(self._command_dict['exitSafeStart'])
+            sequence = self._ENABLE_SEQ
         else:
             warnings.warn('Expected `False` (disabled) or `True` (enable)')
+            return
+        self.com.send_batch([(command, None) for command in sequence])
 
     def getCurrentPositionSteps(self):
         return self.getPosition("steps")
 
+    def getPositionAndVelocity(self) -> tuple:
+        """Fetch current position and velocity with one block read.
+
+        The two variables are adjacent in the Tic variable map, so motion
+        polling loops that want both pay a single transaction instead of
+        calling `_position_in_steps` and `isMoving` separately.
+
+        Returns
+        -------
+        position, velocity : tuple
+            Signed position in microsteps and velocity in microsteps/10000s.
+        """
+        raw = bytes(self._readBlock(self._var_curr_position[0], 8))
+        return (int.from_bytes(raw[:4], 'little', signed=True),
+                int.from_bytes(raw[4:8], 'little', signed=True))
+
     def halt(self):
         """Stop the motor abruptly at the current postition."""
-        command_to_send = self._command_dict['haltAndHoldPosition']
+        command_to_send = self._cmd_haltAndHoldPosition
         self.com.send(command_to_send)
 
     def home(self, direc: str):
@@ -216,7 +282,7 @@ class TicStepper(StepperBase):
         """
         limit_available = self.checkLimitSwitch(direc)
         if limit_available:
-            command_to_send = self._command_dict['goHome']
+            command_to_send = self._cmd_goHome
             if direc == 'fwd':
                 data = 1
             else:
@@ -236,74 +302,173 @@ class TicStepper(StepperBase):
         position_known : bool
             True if 'position uncertain' flag is not set.
         """
-        command_to_send = self._command_dict['gVariable']
-        data = self._variable_dict['misc_flags1']
-        b = self.com.send(command_to_send, data)
+        b = self.com.send(self._cmd_gVariable, self._var_misc_flags1)
         position_known = (b[0] & 2) == 0
         return position_known
 
     def isMoving(self) -> bool:
         """Check the 'current velocity' value of the Tic driver."""
-        command_to_send = self._command_dict['gVariable']
-        data = self._variable_dict['curr_velocity']
-        b = self.com.send(command_to_send, data)
+        b = self.com.send(self._cmd_gVariable, self._var_curr_velocity)
         velocity = self.bytesToInt(b)
         return velocity != 0
 
+    async def isMovingAsync(self) -> bool:
+        """Check the 'current velocity' value without blocking the loop.
+
+        Async counterpart to `isMoving`; the bus transaction runs on the
+        com worker thread so other coroutines (logging, cameras) proceed
+        during the I/O latency.
+        """
+        b = await self.com.send_async(self._cmd_gVariable,
+                                      self._var_curr_velocity)
+        return self.bytesToInt(b) != 0
+
     def setCurrentLimit(self, milliamp_code: int):
         """Review https://www.pololu.com/docs/0J71/6#setting-current-limit ."""
-        command_to_send = self._command_dict['sCurrentLimit']
-        data = milliamp_code
+        command_to_send = self._cmd_sCurrentLimit
+        data = int(milliamp_code)
         self.com.send(command_to_send, data)
 
     def setCurrentPositionAs(self, positionSteps: int):
         """Zero the current position."""
-        if type(positionSteps) != int:
+        if not isinstance(positionSteps, int) or \
+                isinstance(positionSteps, bool):
             warnings.warn('"positionSteps" must be an integer')
             return
 
-        command_to_send = self._command_dict['haltAndSetPosition']
+        command_to_send = self._cmd_haltAndSetPosition
         data = positionSteps
         self.com.send(command_to_send, data)
         self._target_steps = positionSteps
 
+    def waitUntilStopped(self, timeout=None, initial=1e-3,
+                           max_interval=0.05):
+        """Block until the motor reports zero velocity.
+
+        Polls `isMoving` with exponential backoff, so a freshly issued move
+        is noticed quickly while long moves settle to one read per
+        `max_interval` instead of hammering the bus. A few ms of extra
+        polling latency is negligible against moves that take seconds.
+
+        Parameters
+        ----------
+        timeout : float or None
+            Give up after this many seconds; None waits indefinitely.
+        initial : float
+            First sleep interval in seconds.
+        max_interval : float
+            Upper bound on the sleep interval in seconds.
+
+        Returns
+        -------
+        stopped : bool
+            True once the motor is stopped, False on timeout.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        interval = initial
+        while self.isMoving():
+            if deadline is not None and monotonic() >= deadline:
+                return False
+            sleep(interval)
+            interval = min(interval * 1.5, max_interval)
+        return True
+
+    async def waitUntilStoppedAsync(self, poll_period: float = 0.05):
+        """Poll current velocity without blocking the event loop.
+
+        Async counterpart to `waitUntilStopped`, suffixed like
+        `isMovingAsync` so the blocking and coroutine variants cannot be
+        mistaken for each other. Yields to other coroutines between reads,
+        so several motors can be awaited concurrently instead of
+        busy-waiting on one bus at a time.
+
+        Parameters
+        ----------
+        poll_period : float
+            Delay in seconds between velocity reads.
+        """
+        while await self.isMovingAsync():
+            await asyncio.sleep(poll_period)
+
+    def snapshot(self) -> Snapshot:
+        """Fetch the commonly polled status variables in one transaction.
+
+        The Tic variable map is contiguous, so operation state, misc flags,
+        error status, current position, and current velocity can be read as
+        a single block instead of one round-trip apiece.
+
+        Returns
+        -------
+        snapshot : Snapshot
+            Decoded values for the polled variables.
+        """
+        raw = bytes(self._readBlock(0x00, 0x2A))
+        return Snapshot(
+            operation_state=raw[0],
+            misc_flags1=raw[1],
+            error_status=int.from_bytes(raw[2:4], 'little'),
+            curr_position=int.from_bytes(raw[0x22:0x26], 'little',
+                                         signed=True),
+            curr_velocity=int.from_bytes(raw[0x26:0x2A], 'little',
+                                         signed=True))
+
+    def refreshState(self, max_age: float = 0.01) -> Snapshot:
+        """Return a recent `Snapshot`, reusing one newer than `max_age`.
+
+        Consumers that inspect several variables within one control tick
+        share a single block read instead of paying a transaction apiece;
+        `max_age` bounds the staleness. Pass 0 to force a fresh read.
+
+        Parameters
+        ----------
+        max_age : float
+            Maximum acceptable cache age in seconds.
+
+        Returns
+        -------
+        snapshot : Snapshot
+            Decoded values for the polled variables.
+        """
+        now = monotonic()
+        if self._state_cache is None or now - self._state_ts >= max_age:
+            self._state_cache = self.snapshot()
+            self._state_ts = now
+        return self._state_cache
+
     def velocityControl(self, steps_per_10000s):
         """Set the motor to move at the specified velocity."""
 
-        command_to_send = self._command_dict['sTargetVelocity']
-        data = steps_per_10000s
-        self.com.send(command_to_send, data)
+        command_to_send = self._cmd_sTargetVelocity
+        self.com.send(command_to_send, int(steps_per_10000s))
     
     def _comProtocol(self, com_type: str) -> int:
         """Determine communication protocol from user input."""
-        if com_type in ('serial', 'ser', 'Serial'):
-            protocol = self._com_protocol['SERIAL']
-        elif com_type in ('i2c', 'I2C'):
-            protocol = self._com_protocol['I2C']
-        else:
+        protocol = self._com_type_map.get(com_type, -1)
+        if protocol < 0:
             raise ValueError('Expected protocol com_type `serial` or `i2c`.')
         return protocol
 
     def _moveToTarget(self):
         """Communicate with Tic board to set target position in steps."""
 
-        command_to_send = self._command_dict['sTargetPosition']
-        data = self._target_steps
-        self.com.send(command_to_send, data)
+        self.com.send(self._cmd_sTargetPosition, int(self._target_steps))
+
+    def _readBlock(self, offset: int, num_bytes: int) -> list:
+        """Block-read `num_bytes` contiguous variable bytes at `offset`.
+
+        The Tic variable map is contiguous, so adjacent variables can be
+        fetched in one transaction instead of one round-trip apiece.
+        """
+        return self.com.send(self._cmd_gVariable, (offset, num_bytes))
 
     def _position_in_steps(self):
         """Process Tic output for location in steps.
 
-        32-bit readings return bytes in reverse order. Elements need to be
-        shifted accordingly and the sign of the value needs to be checked.
+        32-bit readings return bytes in reverse order and are signed, which
+        `int.from_bytes` handles in a single call.
         """
-        command_to_send = self._command_dict['gVariable']
-        data = self._variable_dict['curr_position']
-        b = self.com.send(command_to_send, data)
-        location = self.bytesToInt(b)
-        if location >= (1 << 31):
-            location -= (1 << 32)
-        return location
+        b = self.com.send(self._cmd_gVariable, self._var_curr_position)
+        return self.bytesToSignedInt(b)
 
     def _setAccel(self, val: int):
         """Communicate with the Tic board to set max acceleration.
@@ -314,7 +479,7 @@ class TicStepper(StepperBase):
             Max acceleration value in microsteps/s^2.
 
         """
-        command_to_send = self._command_dict['sMaxAccel']
+        command_to_send = self._cmd_sMaxAccel
         data = val
         self.com.send(command_to_send, data)
 
@@ -327,7 +492,7 @@ class TicStepper(StepperBase):
             Max deceleration value in microsteps/s^2.
 
         """
-        command_to_send = self._command_dict['sMaxDecel']
+        command_to_send = self._cmd_sMaxDecel
         data = val
         self.com.send(command_to_send, data)
 
@@ -343,18 +508,19 @@ class TicStepper(StepperBase):
             are 1, 2, 4, 8 for the T500 (https://www.pololu.com/docs/0J71/8#cmd-set-step-mode)
         """
 
+        data = self._step_mode_map.get(microstep)
+        if data is None:
+            raise ValueError('Unsupported microstep value: {}. Allowable '
+                             'values are {}.'
+                             .format(microstep,
+                                     sorted(self._step_mode_map)))
         self._microsteps_per_full_step = microstep
-        command_to_send = self._command_dict['sStepMode']
-        data = (microstep == 0b10) \
-            + (microstep == 0b100) * 2 \
-            + (microstep == 0b1000) * 3
+        command_to_send = self._cmd_sStepMode
         self.com.send(command_to_send, data)
 
     def _setSpeed(self, speed: float):
         """Communicate with the Tic board to set velocity in steps / 10000s."""
-        command_to_send = self._command_dict['sMaxSpeed']
-        data = speed * 10000
-        self.com.send(command_to_send, data)
+        self.com.send(self._cmd_sMaxSpeed, int(speed * 10000))
 
     def _getmotor_status(self) -> tuple:
         """Poll the tic flag for position certainty
@@ -367,15 +533,15 @@ class TicStepper(StepperBase):
         """
 
         try:
-            misc_resp = self.com.send(self._command_dict['gVariable'], self._variable_dict['misc_flags1'])
-            err_resp = self.com.send(self._command_dict['gVariable'], self._variable_dict['error_status'])
-            op_resp = self.com.send(self._command_dict['gVariable'], self._variable_dict['operation_state'])
+            # operation_state, misc_flags1, and error_status are contiguous
+            # at 0x00-0x03, so one block read replaces three transactions.
+            buf = self._readBlock(self._var_operation_state.addr, 4)
         except Exception as e:
             print("Error reading motor status")
             print(e)
             return False, False, False
 
-        return misc_resp, err_resp, op_resp
+        return buf[1:2], buf[2:4], buf[0:1]
 
     def getAndParseMotorStatus(self)-> dict:
         """Gets all the status reports from the motor and translates them into english for printing/display
@@ -389,18 +555,14 @@ class TicStepper(StepperBase):
         # Poll the motor for statuses
         misc_resp, err_resp, op_resp = self._getmotor_status()
 
-        # Parse the responses
-        misc_msg = list()
-        op_msg = list()
-        err_msg = list()
-        for i in range(_MAX_RESP_BITS):
-            if misc_resp[0] & 2**i:
-                misc_msg.append(_misc_bit_dict[i])
-            # op_resp format is not a bit lookup - they are just even integers
-            if op_resp[0] == 2*i:
-                op_msg.append(_op_state_dict[2*i])
-            if err_resp[0] & 2**i:
-                err_msg.append(_error_status_dict[i])
+        # Parse the responses; only set bits are touched
+        misc_msg = [name for mask, name in _misc_bits
+                    if misc_resp[0] & mask]
+        err_msg = [name for mask, name in _error_bits
+                   if err_resp[0] & mask]
+        # op_resp format is not a bit lookup - it is a direct state code
+        op_msg = ([_op_state_dict[op_resp[0]]]
+                  if op_resp[0] in _op_state_dict else [])
 
         motor_status = {'OperationStatus': op_msg, \
                        'ErrorStatus': err_msg, \
@@ -427,71 +589,92 @@ class TicStepper(StepperBase):
 
     _com_protocol = {'SERIAL': 0, 'I2C': 1}
 
-    _command_dict = \
+    # Accepted com_type spellings mapped straight to protocol codes
+    _com_type_map = {'serial': _com_protocol['SERIAL'],
+                     'ser': _com_protocol['SERIAL'],
+                     'Serial': _com_protocol['SERIAL'],
+                     'i2c': _com_protocol['I2C'],
+                     'I2C': _com_protocol['I2C']}
+
+    # Microsteps per full-step -> sStepMode data field (2^n encoding)
+    _step_mode_map = {1: 0, 2: 1, 4: 2, 8: 3}
+
+    _command_dict = types.MappingProxyType(
         {  # 'commandKey': [command_address, operation] # Data
-            'sTargetPosition': [0xE0, 32],  # microsteps
-            'sTargetVelocity': [0xE3, 32],  # microsteps / 10,000s
-            'haltAndSetPosition': [0xEC, 32],  # microsteps
-            'haltAndHoldPosition': [0x89, 'quick'],  # NONE
-            'goHome': [0x97, 7],  # 0: rev, 1: fwd
-            'rstCommandTimeout': [0x8C, 'quick'],  # NONE
-            'deenergize': [0x86, 'quick'],  # NONE
-            'energize': [0x85, 'quick'],  # NONE
-            'exitSafeStart': [0x83, 'quick'],  # NONE
-            'enterSafeStart': [0x8F, 'quick'],  # NONE
-            'rst': [0xB0, 'quick'],  # NONE
-            'clrDriverError': [0x8A, 'quick'],  # NONE
-            'sMaxSpeed': [0xE6, 32],  # microsteps / 10,000s
-            'sStartingSpeed': [0xE5, 32],  # microsteps / 10,000s
-            'sMaxAccel': [0xEA, 32],  # microsteps / 100(s^2)
-            'sMaxDecel': [0xE9, 32],  # microsteps / 100(s^2)
-            'sStepMode': [0x94, 7],  # 0<=n<=3 (microsteps = 2^n)
-            'sCurrentLimit': [0x91, 7],  # 0 to 124
-            'gVariable': [0xA1, 'read'],  # block read
-            'gVarAndClearErrs': [0xA2, 'read'],  # block read
-            'gSetting': [0xA8, 'read'],  # block read
-        }  # documentation: https://www.pololu.com/docs/0J71/8
-
-    _variable_dict = \
+            'sTargetPosition': Cmd(0xE0, 32),  # microsteps
+            'sTargetVelocity': Cmd(0xE3, 32),  # microsteps / 10,000s
+            'haltAndSetPosition': Cmd(0xEC, 32),  # microsteps
+            'haltAndHoldPosition': Cmd(0x89, 'quick'),  # NONE
+            'goHome': Cmd(0x97, 7),  # 0: rev, 1: fwd
+            'rstCommandTimeout': Cmd(0x8C, 'quick'),  # NONE
+            'deenergize': Cmd(0x86, 'quick'),  # NONE
+            'energize': Cmd(0x85, 'quick'),  # NONE
+            'exitSafeStart': Cmd(0x83, 'quick'),  # NONE
+            'enterSafeStart': Cmd(0x8F, 'quick'),  # NONE
+            'rst': Cmd(0xB0, 'quick'),  # NONE
+            'clrDriverError': Cmd(0x8A, 'quick'),  # NONE
+            'sMaxSpeed': Cmd(0xE6, 32),  # microsteps / 10,000s
+            'sStartingSpeed': Cmd(0xE5, 32),  # microsteps / 10,000s
+            'sMaxAccel': Cmd(0xEA, 32),  # microsteps / 100(s^2)
+            'sMaxDecel': Cmd(0xE9, 32),  # microsteps / 100(s^2)
+            'sStepMode': Cmd(0x94, 7),  # 0<=n<=3 (microsteps = 2^n)
+            'sCurrentLimit': Cmd(0x91, 7),  # 0 to 124
+            'gVariable': Cmd(0xA1, 'read'),  # block read
+            'gVarAndClearErrs': Cmd(0xA2, 'read'),  # block read
+            'gSetting': Cmd(0xA8, 'read'),  # block read
+        })  # documentation: https://www.pololu.com/docs/0J71/8
+
+    _variable_dict = types.MappingProxyType(
         {  # 'variable_key': [offset_address, bytes_to_read]
-            'operation_state': [0x00, 1],
-            'misc_flags1': [0x01, 1],
-            'error_status': [0x02, 2],
-            'errors_occured': [0x04, 4],
-            'planning_mode': [0x09, 1],
-            'target_position': [0x0A, 4],
-            'target_velocity': [0x0E, 4],
-            'starting_speed': [0x12, 4],
-            'max_speed': [0x16, 4],
-            'max_decel': [0x1A, 4],
-            'max_accel': [0x1E, 4],
-            'curr_position': [0x22, 4],
-            'curr_velocity': [0x26, 4],
-            'acting_tar_pos': [0x2A, 4],
-            'time_since_last_step': [0x2E, 4],  # 1/3us
-            'device_rst': [0x32, 1],
-            'vin_voltage': [0x33, 2],
-            'uptime': [0x35, 4],
-            'encoder_pos': [0x39, 4],
-            'rc_pulse_width': [0x3D, 2],
-            'analog_reading_SCL': [0x3F, 2],
-            'analog_reading_SDA': [0x41, 2],
-            'analog_reading_TX': [0x43, 2],
-            'analog_reading_RX': [0x45, 2],
-            'digital_readings': [0x47, 1],
-            'pin_states': [0x48, 1],
-            'step_mode': [0x49, 1],
-            'current_limit': [0x4A, 1],
-            'input_state': [0x4C, 1],
-            'last_driver_error': [0x55, 1],
-        }  # documentation: https://www.pololu.com/docs/0J71/7
-
-
-    _setting_dict = \
+            'operation_state': Var(0x00, 1),
+            'misc_flags1': Var(0x01, 1),
+            'error_status': Var(0x02, 2),
+            'errors_occured': Var(0x04, 4),
+            'planning_mode': Var(0x09, 1),
+            'target_position': Var(0x0A, 4),
+            'target_velocity': Var(0x0E, 4),
+            'starting_speed': Var(0x12, 4),
+            'max_speed': Var(0x16, 4),
+            'max_decel': Var(0x1A, 4),
+            'max_accel': Var(0x1E, 4),
+            'curr_position': Var(0x22, 4),
+            'curr_velocity': Var(0x26, 4),
+            'acting_tar_pos': Var(0x2A, 4),
+            'time_since_last_step': Var(0x2E, 4),  # 1/3us
+            'device_rst': Var(0x32, 1),
+            'vin_voltage': Var(0x33, 2),
+            'uptime': Var(0x35, 4),
+            'encoder_pos': Var(0x39, 4),
+            'rc_pulse_width': Var(0x3D, 2),
+            'analog_reading_SCL': Var(0x3F, 2),
+            'analog_reading_SDA': Var(0x41, 2),
+            'analog_reading_TX': Var(0x43, 2),
+            'analog_reading_RX': Var(0x45, 2),
+            'digital_readings': Var(0x47, 1),
+            'pin_states': Var(0x48, 1),
+            'step_mode': Var(0x49, 1),
+            'current_limit': Var(0x4A, 1),
+            'input_state': Var(0x4C, 1),
+            'last_driver_error': Var(0x55, 1),
+        })  # documentation: https://www.pololu.com/docs/0J71/7
+
+
+    _setting_dict = types.MappingProxyType(
         {
-            'limit_switch_fwd': [0x5F, 1],
-            'limit_switch_rev': [0x60, 1],
-        }
+            'limit_switch_fwd': Var(0x5F, 1),
+            'limit_switch_rev': Var(0x60, 1),
+        })
+
+    # Command bursts issued by the enable setter, bound once at class scope
+    _DISABLE_SEQ = (_command_dict['enterSafeStart'],
+                    _command_dict['deenergize'])
+    _ENABLE_SEQ = (_command_dict['energize'],
+                   _command_dict['exitSafeStart'])
+
+
+# Offsets of the write-only 'quick' commands, used to prebuild serial frames
+_QUICK_OFFSETS = tuple(cmd.addr for cmd in TicStepper._command_dict.values()
+                       if cmd.proto == 'quick')
 
 
 class TicSerial():
@@ -507,24 +690,57 @@ class TicSerial():
         Int specifying device number on bus.
     """
 
-    def __init__(self, port_name, baud_rate, device_number=None):
+    def __init__(self, port_name, baud_rate, device_number=None,
+                 timeout=0.1):
         self.port = serial.Serial(port_name, baud_rate,
-                                  timeout=0.1, write_timeout=0.1)
+                                  timeout=timeout, write_timeout=timeout)
         self.device_number = device_number
+        self.timeout = timeout
+        self._executor = None  # created on first send_async
+        self._tx_buf = bytearray(8)  # reused for every outgoing packet
+        # Quick-command frames never change once device_number is known
+        self._quick_frames = {offset: self._makeSerialInput(offset)
+                              for offset in _QUICK_OFFSETS}
+        if hasattr(self.port, 'set_buffer_size'):  # Windows-only in pyserial
+            self.port.set_buffer_size(rx_size=8192)
+        try:
+            # Drops the FTDI/USB-serial latency timer from its 16 ms
+            # default to 1 ms; best-effort on platforms without support.
+            self.port.set_low_latency_mode(True)
+        except (AttributeError, ValueError, OSError):
+            pass
 
-    def __del__(self):
-        self.port.close()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the serial port.
+
+        Keep one TicSerial alive for the life of the process rather than
+        opening the port per operation; reopening is slow and discards
+        kernel-side buffering. Safe to call more than once.
+        """
+        if self.port is not None:
+            self.port.close()
+            self.port = None
 
     def _makeSerialInput(self, offset, data=None):
+        buf = self._tx_buf  # header (3) + largest payload (5)
         if self.device_number is None:
-            header = [offset]  # Compact protocol
+            buf[0] = offset  # Compact protocol
+            end = 1
         else:
-            header = [0xAA, self.device_number, offset & 0x7F]
-        if data is None:
-            ret = bytes(header)
-        else:
-            ret = bytes(header + list(data))
-        return ret
+            buf[0] = 0xAA
+            buf[1] = self.device_number
+            buf[2] = offset & 0x7F
+            end = 3
+        if data is not None:
+            buf[end:end + len(data)] = bytes(data)
+            end += len(data)
+        return bytes(memoryview(buf)[:end])
 
     def send(self, operation: list, data: list = None) -> list:
         """
@@ -543,42 +759,125 @@ class TicSerial():
         result : list
             Data read from Tic registers, broken into a list of bytes.
         """
-        offset = operation[0]
-        protocol = operation[1]
-        if protocol == 'quick':  # Quick write
-            command = self._makeSerialInput(offset)
-            read = False
-        elif protocol == 'read':  # Block read
-            command = self._makeSerialInput(offset, data)
-            read = True
-        elif protocol == 7:  # 7-bit write
-            data = [int(data)]
-            command = self._makeSerialInput(offset, data)
-            read = False
-        elif protocol == 32:  # 32-bit write
-            data = int(data)
-            command = self._makeSerialInput(offset,
-                                            [((data >> 7) & 1)
-                                             | ((data >> 14) & 2)
-                                             | ((data >> 21) & 4)
-                                             | ((data >> 28) & 8),
-                                             data >> 0 & 0x7F,
-                                             data >> 8 & 0x7F,
-                                             data >> 16 & 0x7F,
-                                             data >> 24 & 0x7F])
-            read = False
-
-        if read is False:
-            self.port.write(command)
-            ret = []
-        else:
-            self.port.write(command)
-            result = self.port.read(data[1])
-            if len(result) != data[1]:
+        command, read_length = self._makeFrame(operation, data)
+        self.port.write(command)
+        if read_length == 0:
+            return []
+        self._waitForBytes(read_length)
+        result = self.port.read(read_length)
+        if len(result) != read_length:
+            raise RuntimeError("Expected to read {} bytes, got {}."
+                               .format(read_length, len(result)))
+        return bytearray(result)
+
+    def send_many(self, operations: list) -> list:
+        """
+        Pipeline several commands over the port in a single pass.
+
+        All command packets are written back-to-back and the expected reply
+        bytes are collected with one `port.read`, reducing per-command
+        syscall and timeout overhead at low baud rates.
+
+        Parameters
+        ----------
+        operations : list
+            (operation, data) pairs as accepted by `send`.
+
+        Returns
+        -------
+        results : list
+            One `send`-style result per queued operation.
+        """
+        frames = []
+        read_lengths = []
+        for operation, data in operations:
+            command, read_length = self._makeFrame(operation, data)
+            frames.append(command)
+            read_lengths.append(read_length)
+        self.port.write(b''.join(frames))
+        total = sum(read_lengths)
+        raw = b''
+        if total:
+            self._waitForBytes(total)
+            raw = self.port.read(total)
+            if len(raw) != total:
                 raise RuntimeError("Expected to read {} bytes, got {}."
-                                   .format(data[1], len(result)))
-            ret = bytearray(result)
-        return ret
+                                   .format(total, len(raw)))
+        results = []
+        pos = 0
+        for read_length in read_lengths:
+            if read_length:
+                results.append(bytearray(raw[pos:pos + read_length]))
+                pos += read_length
+            else:
+                results.append([])
+        return results
+
+    def send_batch(self, operations: list) -> list:
+        """Issue several commands back-to-back, one frame per command.
+
+        Serial has no per-transaction bus arbitration to amortize, so this
+        is a plain loop kept for API uniformity with `TicI2C.send_batch`.
+        Use `send_many` to additionally pipeline replies into one read.
+        """
+        return [self.send(operation, data) for operation, data in operations]
+
+    def _waitForBytes(self, count):
+        """Poll `in_waiting` until `count` bytes arrive or the timeout ends.
+
+        Short sleeps between polls let transient shortfalls resolve without
+        paying the port's full blocking-read timeout per byte.
+        """
+        deadline = monotonic() + (self.timeout or 0.1)
+        while monotonic() < deadline:
+            waiting = self.port.in_waiting
+            if not isinstance(waiting, int) or waiting >= count:
+                return
+            sleep(0.001)
+
+    async def send_async(self, operation: list, data: list = None) -> list:
+        """Run `send` on this port's worker thread without blocking the loop.
+
+        A dedicated single-thread executor keeps commands serialized while
+        letting the caller interleave other coroutines during port latency.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.send,
+                                          operation, data)
+
+    def _frameQuick(self, offset, _data):
+        frame = self._quick_frames.get(offset)
+        if frame is None:
+            frame = self._makeSerialInput(offset)
+        return frame, 0
+
+    def _frameRead(self, offset, data):
+        return self._makeSerialInput(offset, data), data[1]
+
+    def _frame7Bit(self, offset, data):
+        return self._makeSerialInput(offset, [data]), 0
+
+    def _frame32Bit(self, offset, data):
+        b0, b1, b2, b3 = _pack_u32.pack(data & 0xFFFFFFFF)
+        return self._makeSerialInput(offset,
+                                     [(b0 >> 7)
+                                      | (b1 >> 6 & 2)
+                                      | (b2 >> 5 & 4)
+                                      | (b3 >> 4 & 8),
+                                      b0 & 0x7F,
+                                      b1 & 0x7F,
+                                      b2 & 0x7F,
+                                      b3 & 0x7F]), 0
+
+    # Protocol tag -> frame builder; dispatch is a single dict lookup.
+    _frame_builders = {'quick': _frameQuick, 'read': _frameRead,
+                       7: _frame7Bit, 32: _frame32Bit}
+
+    def _makeFrame(self, operation, data=None):
+        """Build one command packet and its expected reply length."""
+        return self._frame_builders[operation[1]](self, operation[0], data)
 
 
 class TicI2C():
@@ -594,12 +893,94 @@ class TicI2C():
         Int specifying the device address on the bus.
     """
 
+    # Lazy fallbacks for instances built without __init__ (e.g. test mocks).
+    _scratch = None
+    _quick_msgs = None
+    _read_cmd_msgs = None
+
+    def _buildQuick(self, offset, _data):
+        if self._quick_msgs is None:
+            self._quick_msgs = {}
+        write = self._quick_msgs.get(offset)
+        if write is None:
+            write = i2c_msg.write(self.address, [offset])
+            self._quick_msgs[offset] = write
+        return write, None
+
+    def _buildRead(self, offset, data):
+        # The command half of a read never changes for a given variable, so
+        # it is pooled; the reply message is fresh per call because the bus
+        # fills its buffer with each transaction.
+        if self._read_cmd_msgs is None:
+            self._read_cmd_msgs = {}
+        key = (offset, data[0])
+        write = self._read_cmd_msgs.get(key)
+        if write is None:
+            write = i2c_msg.write(self.address, [offset, data[0]])
+            self._read_cmd_msgs[key] = write
+        return write, i2c_msg.read(self.address, data[1])
+
+    def _build7Bit(self, offset, data):
+        return i2c_msg.write(self.address, [offset, data]), None
+
+    def _build32Bit(self, offset, data):
+        if self._scratch is None:
+            self._scratch = bytearray(6)
+        self._scratch[0] = offset
+        _pack_u32.pack_into(self._scratch, 1, data & 0xFFFFFFFF)
+        return (i2c_msg.write(self.address,
+                              list(memoryview(self._scratch)[:5])), None)
+
+    # Protocol tag -> message builder; dispatch is a single dict lookup.
+    _msg_builders = {'quick': _buildQuick, 'read': _buildRead,
+                     7: _build7Bit, 32: _build32Bit}
+
     def __init__(self, bus, address):
         self.bus = SMBus(bus)
         self.address = address
+        self._scratch = bytearray(6)  # sized for the largest write packet
+        self._quick_msgs = {}  # reusable i2c_msg.write objects per opcode
+        self._read_cmd_msgs = {}  # reusable read-command messages
+        self._executor = None  # created on first send_async
+        clock = self._busClockHz(bus)
+        if clock is not None and clock < 400000:
+            warnings.warn('I2C bus {} is clocked at {} Hz; the Tic supports '
+                          '400 kHz. On Raspberry Pi set '
+                          'dtparam=i2c_arm_baudrate=400000 in /boot/config.txt'
+                          ' for ~4x faster transactions.'.format(bus, clock))
 
-    def __del__(self):
-        self.bus.close()
+    @staticmethod
+    def _busClockHz(bus_number):
+        """Best-effort read of the adapter clock from the device tree.
+
+        Returns None when the platform does not expose the setting. The bus
+        speed cannot be changed at runtime from userland, so a slow clock is
+        only reported, not fixed.
+        """
+        path = ('/sys/class/i2c-adapter/i2c-{}/of_node/clock-frequency'
+                .format(bus_number))
+        try:
+            with open(path, 'rb') as node:
+                return int.from_bytes(node.read(4), 'big')
+        except (OSError, ValueError):
+            return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the I2C bus.
+
+        Keep one TicI2C alive for the life of the process rather than
+        opening the bus per operation; re-enumerating /dev/i2c-* handles
+        costs milliseconds. Safe to call more than once.
+        """
+        if self.bus is not None:
+            self.bus.close()
+            self.bus = None
 
     def send(self, operation: list, data=None) -> list:
         """
@@ -615,35 +996,67 @@ class TicI2C():
 
         Returns
         -------
-        read : list
-            Data read from Tic registers, broken into a list of bytes.
+        read : bytes
+            Data read from Tic registers; empty list for write commands.
         """
-        offset = operation[0]
-        protocol = operation[1]
-        if protocol == 'quick':  # Quick write
-            command = [offset]
-            read = None
-        elif protocol == 'read':  # Block read
-            command = [offset, data[0]]
-            read = i2c_msg.read(self.address, data[1])
-        elif protocol == 7:  # 7-bit write
-            command = [offset, int(data)]
-            read = None
-        elif protocol == 32:  # 32-bit write
-            data = int(data)
-            command = [offset,
-                       data >> 0 & 0xFF,
-                       data >> 8 & 0xFF,
-                       data >> 16 & 0xFF,
-                       data >> 24 & 0xFF]
-            read = None
-        else:
-            warnings.warn('Protocol `{}` not recognized.'.format(protocol))
-
-        write = i2c_msg.write(self.address, command)
-        self.bus.i2c_rdwr(write)
-        ret = []
-        if read is not None:
-            self.bus.i2c_rdwr(read)
-            ret = list(read)
-        return ret
+        builder = self._msg_builders.get(operation[1])
+        if builder is None:
+            warnings.warn('Protocol `{}` not recognized.'
+                          .format(operation[1]))
+            return []
+        write, read = builder(self, operation[0], data)
+        if read is None:
+            self.bus.i2c_rdwr(write)
+            return []
+        # One i2c_rdwr dispatches both messages with a repeated START
+        # between them - a single ioctl instead of two.
+        self.bus.i2c_rdwr(write, read)
+        return bytes(read)
+
+    def send_batch(self, operations: list) -> list:
+        """
+        Dispatch several commands as one multi-segment I2C transaction.
+
+        smbus2 joins the messages with repeated STARTs, so the whole batch
+        costs a single ioctl instead of one per command.
+
+        Parameters
+        ----------
+        operations : list
+            (operation, data) pairs as accepted by `send`.
+
+        Returns
+        -------
+        results : list
+            One `send`-style result per queued operation.
+        """
+        msgs = []
+        reads = []
+        for operation, data in operations:
+            builder = self._msg_builders.get(operation[1])
+            if builder is None:
+                warnings.warn('Protocol `{}` not recognized.'
+                              .format(operation[1]))
+                reads.append(None)
+                continue
+            write, read = builder(self, operation[0], data)
+            msgs.append(write)
+            if read is not None:
+                msgs.append(read)
+            reads.append(read)
+        if msgs:
+            self.bus.i2c_rdwr(*msgs)
+        return [[] if read is None else bytes(read) for read in reads]
+
+    async def send_async(self, operation: list, data=None) -> list:
+        """Run `send` on this bus's worker thread without blocking the loop.
+
+        A dedicated single-thread executor keeps transactions serialized
+        while letting the caller interleave other coroutines during bus
+        latency.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.send,
+                                          operation, data)
@@ -23,14 +23,12 @@ def main():
   lims = myStage.getMotionRange()
   print(f"Lims: {lims[0]}, {lims[1]}")
   num_pos = 3
-  values = np.round(np.linspace(lims[0], lims[1], num_pos))
-  keys = range(num_pos)
-  posDict = dict(zip(keys,values))
-  myStage.setIndexedPositions(posDict)
-  print(f"posDict: {posDict}")
+  values = np.round(np.linspace(lims[0], lims[1], num_pos)).astype(np.int64)
+  myStage.setIndexedPositions(dict(enumerate(values)))
+  print(f"positions: {values}")
   try:
-    for pos in keys:
-      print(f"Moving to index {pos} at position {posDict[pos]}")
+    for pos, value in enumerate(values):
+      print(f"Moving to index {pos} at position {value}")
       result = myStage.moveToIndexedPosition(pos, True)
       if result:
         print("Position reached")
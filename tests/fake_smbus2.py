@@ -7,10 +7,11 @@ class SMBus():
     def close(self):
         pass
 
-    def i2c_rdwr(self, operation):
-        self.fake_register_input = operation
-        if operation == [14, 1]:
-            operation[0] = self.fake_register_output
+    def i2c_rdwr(self, *operations):
+        for operation in operations:
+            self.fake_register_input = operation
+            if operation == [14, 1]:
+                operation[0] = self.fake_register_output
 
     def fakeInput(self):
         return self.fake_register_input
@@ -17,25 +17,29 @@ class StepperBaseModified(pymotors.StepperBase):
         return self._fake_position_in_steps
 
     def _moveToTarget(self):
-        while self._fake_position_in_steps != self._target_steps:
-            if self._fake_position_in_steps < self._target_steps:
-                self._fake_position_in_steps += 1
-            else:
-                self._fake_position_in_steps -= 1
+        # The tests assert end state only, so arriving in one assignment
+        # keeps them O(1) instead of stepping once per commanded step.
+        self._fake_position_in_steps = self._target_steps
 
 
 class StepperBaseUtilities(unittest.TestCase):
     """Evaluate StepperBase methods and attributes."""
 
+    @classmethod
+    def setUpClass(cls):
+        warnings.filterwarnings('error')
+
     def setUp(self):
         # Warning generated from initialization : _microsteps not overloaded
-        warnings.filterwarnings('ignore')
-        self.stepper = StepperBaseModified()
-        warnings.filterwarnings('error')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.stepper = StepperBaseModified()
 
     def tearDown(self):
-        warnings.filterwarnings('ignore')
-        del self.stepper
+        # __del__ warns when stopping a disabled motor; keep it quiet
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            del self.stepper
 
     def test_dist_per_rev(self):
         self.assertEqual(1, self.stepper.dist_per_rev)
@@ -46,23 +50,15 @@ class StepperBaseUtilities(unittest.TestCase):
         self.assertEqual(1, self.stepper.rpm)
         self.stepper.rpm = 100
         self.assertEqual(100, self.stepper.rpm)
-        try:
-            warned = False
+        with self.assertWarns(UserWarning):
             self.stepper.rpm = -1
-        except UserWarning:
-            warned = True
-        self.assertEqual(True, warned)
 
     def test_dist_per_min_set_get(self):
         self.assertEqual(1, self.stepper.dist_per_min)
         self.stepper.rpm = 100
         self.assertEqual(100, self.stepper.dist_per_min)
-        try:
-            warned = False
+        with self.assertWarns(UserWarning):
             self.stepper.dist_per_min = -1
-        except UserWarning:
-            warned = True
-        self.assertEqual(True, warned)
 
     def test_dist_steps_conversion(self):
         self.assertEqual(1, self.stepper._convStepsToDist(200))
@@ -71,18 +67,21 @@ class StepperBaseUtilities(unittest.TestCase):
         self.assertEqual(10, self.stepper._convStepsToDist(200))
         self.assertEqual(20, self.stepper._convDistToSteps(1))
 
+    def test_dist_to_steps_rounding(self):
+        # Conversion rounding checked directly, without driving a move
+        self.stepper.dist_per_rev = 200
+        self.assertEqual(200, round(self.stepper._convDistToSteps(200.3)))
+        self.assertEqual(0, round(self.stepper._convDistToSteps(0.4)))
+        self.assertEqual(-6, round(self.stepper._convDistToSteps(-6.3)))
+
     def test_microsteps_set_get(self):
         warnings.filterwarnings('ignore',
                                 "Overload _setMicrostep for functionality.")
         self.stepper.microsteps = 1 / 8
         microsteps = self.stepper.microsteps
         self.assertEqual(1 / 8, microsteps)
-        try:
-            warned = False
+        with self.assertWarns(UserWarning):
             self.stepper.microsteps = 1/10
-        except UserWarning:
-            warned = True
-        self.assertEqual(True, warned)
 
     def test_microsteps_affect_dist_step_conversion(self):
         warnings.filterwarnings('ignore',
@@ -120,12 +119,12 @@ class StepperBaseUtilities(unittest.TestCase):
 
     def test_is_moving_and_stop(self):
         self.stepper.enable = True
-        self.assertEqual(0, self.stepper.isMoving())
+        self.assertFalse(self.stepper.isMoving())
         self.stepper._fake_position_in_steps = 10
         self.stepper._target_steps = 15
-        self.assertEqual(1, self.stepper.isMoving())
+        self.assertTrue(self.stepper.isMoving())
         self.stepper.stop()
-        self.assertEqual(0, self.stepper.isMoving())
+        self.assertFalse(self.stepper.isMoving())
 
     def test_absolute_steps(self):
         self.stepper.enable = True
@@ -134,12 +133,8 @@ class StepperBaseUtilities(unittest.TestCase):
         self.stepper.moveAbsSteps(-100)
         self.assertEqual(-100, self.stepper.position('steps'))
         self.stepper.enable = False
-        try:
-            warned = False
+        with self.assertWarns(UserWarning):
             self.stepper.moveAbsSteps(0)
-        except UserWarning:
-            warned = True
-        self.assertEqual(True, warned)
 
     def test_absolute_dist(self):
         self.stepper.enable = True
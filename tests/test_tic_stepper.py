@@ -1,4 +1,5 @@
 """Pololu Tic stepper driver unit tests."""
+import asyncio
 import unittest
 from unittest.mock import patch
 import warnings
@@ -27,18 +28,19 @@ class TicI2cUtilities(unittest.TestCase):
 
     def test_data_larger_than_7_bit(self):
         payload = 1024
-        try:
-            warned = 0
+        with self.assertRaises(ValueError):
             self.stepper.send([0xAA, 7], payload)
-        except ValueError:
-            warned = 1
-        self.assertEqual(1, warned)
 
     def test_fake_32bit_send(self):
         payload = 2147483647
         output = self.stepper.send([0xBB, 32], payload)
         self.assertEqual([], output)
 
+    def test_send_batch(self):
+        output = self.stepper.send_batch([([0x99, 'quick'], None),
+                                          ([0xBB, 32], 1000)])
+        self.assertEqual([[], []], output)
+
     @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_fake_read(self):
         self.stepper.send([0x00, 'quick'])  # purge native i2c_msg
@@ -46,7 +48,7 @@ class TicI2cUtilities(unittest.TestCase):
         read_bits = 8
         payload = [0x33, read_bits]
         output = self.stepper.send([0xCC, 'read'], payload)
-        self.assertEqual(self.stepper.bus.fake_register_output, output)
+        self.assertEqual(bytes(self.stepper.bus.fake_register_output), output)
 
     @patch('pymotors.tic_stepper.i2c_msg')
     def test_fake_32_processing(self, mock_i2c):
@@ -114,12 +116,27 @@ class TicSerialUtilities(unittest.TestCase):
     def test_data_larger_than_7_bit(self):
         operation = pymotors.tic_stepper.TicStepper._command_dict['goHome']
         data = 1234
-        try:
-            warned = 0
+        with self.assertRaises(ValueError):
             self.stepper.send(operation, data)
-        except ValueError:
-            warned = 1
-        self.assertEqual(True, warned)
+
+    def test_send_async(self):
+        operation = pymotors.tic_stepper.TicStepper._command_dict['energize']
+        asyncio.run(self.stepper.send_async(operation))
+        expected = self.stepper._makeSerialInput(operation[0])
+        self.stepper.port.write.assert_called_with(expected)
+
+    def test_send_many(self):
+        quick_op = pymotors.tic_stepper.TicStepper._command_dict['energize']
+        read_op = pymotors.tic_stepper.TicStepper._command_dict['gVariable']
+        variable = pymotors.tic_stepper.TicStepper._variable_dict['max_speed']
+        self.stepper.port.read.return_value = [1] * variable[1]
+        results = self.stepper.send_many([(quick_op, None),
+                                          (read_op, variable)])
+        expected = bytes(self.stepper._makeSerialInput(quick_op[0])
+                         + self.stepper._makeSerialInput(read_op[0], variable))
+        self.stepper.port.write.assert_called_with(expected)
+        self.stepper.port.read.assert_called_with(variable[1])
+        self.assertEqual([[], bytearray([1] * variable[1])], results)
 
     def test_read(self):
         operation = pymotors.tic_stepper.TicStepper._command_dict['gVariable']
@@ -131,6 +148,7 @@ class TicSerialUtilities(unittest.TestCase):
         self.stepper.port.read.assert_called_with(variable[1])
 
 
+@patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
 class TicStepperI2c(unittest.TestCase):
     @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     @patch('pymotors.tic_stepper.SMBus', new=fake_smbus2.SMBus)
@@ -138,33 +156,22 @@ class TicStepperI2c(unittest.TestCase):
         self.tic = pymotors.tic_stepper.TicStepper('I2C', 3, 14)
         self.cmd = self.tic._command_dict
         self.var = self.tic._variable_dict
+
+    @classmethod
+    def setUpClass(cls):
         warnings.filterwarnings('error')
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_set_microstep(self):
-        self.tic.microsteps = 1/8
-        data_in = self.tic.com.bus.fakeInput()
-        self.assertEqual([self.cmd['sStepMode'][0], 3], data_in[1])
-        micros = self.tic.microsteps
-        self.assertEqual(1/8, micros)
-        self.tic.microsteps = 1/4
-        data_in = self.tic.com.bus.fakeInput()
-        self.assertEqual([self.cmd['sStepMode'][0], 2], data_in[1])
-        self.tic.microsteps = 1/2
-        data_in = self.tic.com.bus.fakeInput()
-        self.assertEqual([self.cmd['sStepMode'][0], 1], data_in[1])
-        self.tic.microsteps = 1
-        data_in = self.tic.com.bus.fakeInput()
-        self.assertEqual([self.cmd['sStepMode'][0], 0], data_in[1])
-        try:
-            warned = False
+        fake_input = self.tic.com.bus.fakeInput
+        step_mode = self.cmd['sStepMode'][0]
+        for ratio, code in ((1/8, 3), (1/4, 2), (1/2, 1), (1, 0)):
+            with self.subTest(ratio=ratio):
+                self.tic.microsteps = ratio
+                self.assertEqual([step_mode, code], fake_input()[1])
+                self.assertEqual(ratio, self.tic.microsteps)
+        with self.assertWarns(UserWarning):
             self.tic.microsteps = 1/6
-            data_in = self.tic.com.bus.fakeInput()
-        except UserWarning:
-            warned = True
-        self.assertEqual(True, warned)
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_rpm_call(self):
         rpm = 0.1
         self.tic.rpm = rpm
@@ -173,18 +180,16 @@ class TicStepperI2c(unittest.TestCase):
         split_input = split32BitI2c(steps_per_sec * 10000)
         self.assertEqual([self.cmd['sMaxSpeed'][0]] + split_input[:], data_in[1])
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_enable(self):
         self.tic.enable = True
         data_in = self.tic.com.bus.fakeInput()
         self.assertEqual(self.cmd['exitSafeStart'][0], data_in[1][0])
-        self.assertEqual(True, self.tic.enable)
+        self.assertTrue(self.tic.enable)
         self.tic.enable = False
         data_in = self.tic.com.bus.fakeInput()
         self.assertEqual(self.cmd['deenergize'][0], data_in[1][0])
-        self.assertEqual(False, self.tic.enable)
+        self.assertFalse(self.tic.enable)
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_move(self):
         self.tic.enable = True
         self.tic.moveAbsSteps(1000)
@@ -192,7 +197,14 @@ class TicStepperI2c(unittest.TestCase):
         split_input = split32BitI2c(1000)
         self.assertEqual([self.cmd['sTargetPosition'][0]] + split_input, data_in[1])
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
+    def test_move_float_target(self):
+        self.tic.enable = True
+        self.tic._target_steps = 1000.0
+        self.tic._moveToTarget()
+        data_in = self.tic.com.bus.fakeInput()
+        split_input = split32BitI2c(1000)
+        self.assertEqual([self.cmd['sTargetPosition'][0]] + split_input, data_in[1])
+
     def test_velocity_control(self):
         self.tic.enable = True
         self.tic.velocityControl(2000000)
@@ -200,25 +212,23 @@ class TicStepperI2c(unittest.TestCase):
         split_input = split32BitI2c(2000000)
         self.assertEqual([self.cmd['sTargetVelocity'][0]] + split_input, data_in[1])
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_set_current_limit(self):
         self.tic.setCurrentLimit(13)
         data_in = self.tic.com.bus.fakeInput()
         self.assertEqual([self.cmd['sCurrentLimit'][0]] + [13], data_in[1])
 
 
-    @patch('pymotors.tic_stepper.i2c_msg', new=fake_smbus2.i2c_msg)
     def test_is_homed(self):
         not_home = 3
         self.tic.com.bus.fake_register_output = not_home
         check_home = self.tic.isHomed()
         data_in = self.tic.com.bus.fakeInput()
         self.assertEqual(self.var['misc_flags1'][0], data_in[1])
-        self.assertEqual(False, check_home)
+        self.assertFalse(check_home)
         is_home = 1
         self.tic.com.bus.fake_register_output = is_home
         check_home = self.tic.isHomed()
-        self.assertEqual(True, check_home)
+        self.assertTrue(check_home)
 
 
 class TicStepperSer(unittest.TestCase):
@@ -234,6 +244,9 @@ class TicStepperSer(unittest.TestCase):
         self.cmd = self.tic._command_dict
         self.var = self.tic._variable_dict
         self.proc = self.tic.com._makeSerialInput
+
+    @classmethod
+    def setUpClass(cls):
         warnings.filterwarnings('error')
 
     def tearDown(self):
@@ -243,26 +256,14 @@ class TicStepperSer(unittest.TestCase):
 
     def test_set_microstep(self):
         operation = self.cmd['sStepMode']
-        self.tic.microsteps = 1/8
-        data_in = self.proc(operation[0], [3])
-        self.write.assert_called_with(data_in)
-        micros = self.tic.microsteps
-        self.assertEqual(1/8, micros)
-        self.tic.microsteps = 1/4
-        data_in = self.proc(operation[0], [2])
-        self.write.assert_called_with(data_in)
-        self.tic.microsteps = 1/2
-        data_in = self.proc(operation[0], [1])
-        self.write.assert_called_with(data_in)
-        self.tic.microsteps = 1
-        data_in = self.proc(operation[0], [0])
-        self.write.assert_called_with(data_in)
-        try:
-            warned = False
+        for ratio, code in ((1/8, 3), (1/4, 2), (1/2, 1), (1, 0)):
+            with self.subTest(ratio=ratio):
+                self.tic.microsteps = ratio
+                data_in = self.proc(operation[0], [code])
+                self.write.assert_called_with(data_in)
+                self.assertEqual(ratio, self.tic.microsteps)
+        with self.assertWarns(UserWarning):
             self.tic.microsteps = 1/6
-        except UserWarning:
-            warned = True
-        self.assertEqual(True, warned)
 
     def test_rpm_value_retained(self):
         val = 0.01
@@ -283,12 +284,12 @@ class TicStepperSer(unittest.TestCase):
         self.tic.enable = True
         data_in = self.proc(operation[0])
         self.write.assert_called_with(data_in)
-        self.assertEqual(True, self.tic.enable)
+        self.assertTrue(self.tic.enable)
         self.tic.enable = False
         operation = self.cmd['deenergize']
         data_in = self.proc(operation[0])
         self.write.assert_called_with(data_in)
-        self.assertEqual(False, self.tic.enable)
+        self.assertFalse(self.tic.enable)
 
     def test_move(self):
         operation = self.cmd['sTargetPosition']
@@ -299,6 +300,15 @@ class TicStepperSer(unittest.TestCase):
         data_in = self.proc(operation[0], split_input)
         self.write.assert_called_with(data_in)
 
+    def test_move_float_target(self):
+        operation = self.cmd['sTargetPosition']
+        self.tic.enable = True
+        self.tic._target_steps = 1000.0
+        self.tic._moveToTarget()
+        split_input = split32BitSer(1000)
+        data_in = self.proc(operation[0], split_input)
+        self.write.assert_called_with(data_in)
+
     def test_is_homed(self):
         operation = self.cmd['gVariable']
         variable = self.var['misc_flags1']
@@ -308,11 +318,11 @@ class TicStepperSer(unittest.TestCase):
         data_in = self.proc(operation[0], variable)
         self.write.assert_called_with(data_in)
         self.read.assert_called_with(variable[1])
-        self.assertEqual(False, check_home)
+        self.assertFalse(check_home)
         is_home = [1]
         self.read.return_value = is_home
         check_home = self.tic.isHomed()
-        self.assertEqual(True, check_home)
+        self.assertTrue(check_home)
 
     def test_set_accel(self):
         ac_val = 10001
@@ -340,6 +350,53 @@ class TicStepperSer(unittest.TestCase):
         self.assertEqual(200, self.tic._target_steps)
         self.write.assert_called_with(data_in)
 
+    def test_snapshot(self):
+        raw = list(range(0x2A))
+        self.read.return_value = raw
+        snap = self.tic.snapshot()
+        self.read.assert_called_with(0x2A)
+        self.assertEqual(raw[0], snap.operation_state)
+        self.assertEqual(raw[1], snap.misc_flags1)
+        self.assertEqual(int.from_bytes(bytes(raw[2:4]), 'little'),
+                         snap.error_status)
+        self.assertEqual(int.from_bytes(bytes(raw[0x22:0x26]), 'little',
+                                        signed=True),
+                         snap.curr_position)
+        self.assertEqual(int.from_bytes(bytes(raw[0x26:0x2A]), 'little',
+                                        signed=True),
+                         snap.curr_velocity)
+
+    def test_refresh_state(self):
+        self.read.return_value = list(range(0x2A))
+        first = self.tic.refreshState()
+        self.read.return_value = [0] * 0x2A
+        self.assertEqual(first, self.tic.refreshState())
+        self.assertNotEqual(first, self.tic.refreshState(max_age=0))
+
+    def test_get_position_and_velocity(self):
+        raw = [0xFF, 0xFF, 0xFF, 0xFF, 10, 0, 0, 0]
+        self.read.return_value = raw
+        position, velocity = self.tic.getPositionAndVelocity()
+        self.read.assert_called_with(8)
+        self.assertEqual(-1, position)
+        self.assertEqual(10, velocity)
+
+    def test_wait_until_stopped(self):
+        self.read.return_value = [0, 0, 0, 0]
+        self.assertTrue(self.tic.waitUntilStopped())
+        self.read.return_value = [1, 0, 0, 0]
+        self.assertFalse(self.tic.waitUntilStopped(timeout=0.01))
+
+    def test_is_moving_async(self):
+        self.read.return_value = [0, 0, 0, 0]
+        self.assertFalse(asyncio.run(self.tic.isMovingAsync()))
+        self.read.return_value = [1, 0, 0, 0]
+        self.assertTrue(asyncio.run(self.tic.isMovingAsync()))
+
+    def test_wait_until_stopped_async(self):
+        self.read.return_value = [0, 0, 0, 0]
+        asyncio.run(self.tic.waitUntilStoppedAsync())
+
     def test_is_moving(self):
         operation = self.cmd['gVariable']
         variable = self.var['curr_velocity']
@@ -351,24 +408,19 @@ class TicStepperSer(unittest.TestCase):
 
 
 def split32BitI2c(data_in):
-    data_in = int(data_in)
-    output = [data_in >> 0 & 0xFF,
-              data_in >> 8 & 0xFF,
-              data_in >> 16 & 0xFF,
-              data_in >> 24 & 0xFF]
-    return output
+    return list((int(data_in) & 0xFFFFFFFF).to_bytes(4, 'little'))
 
 
 def split32BitSer(data_in):
-    data_in = int(data_in)
-    output = [((data_in >> 7) & 1)
-              | ((data_in >> 14) & 2)
-              | ((data_in >> 21) & 4)
-              | ((data_in >> 28) & 8),
-              data_in >> 0 & 0x7F,
-              data_in >> 8 & 0x7F,
-              data_in >> 16 & 0x7F,
-              data_in >> 24 & 0x7F]
+    b = (int(data_in) & 0xFFFFFFFF).to_bytes(4, 'little')
+    output = [(b[0] >> 7)
+              | (b[1] >> 6 & 2)
+              | (b[2] >> 5 & 4)
+              | (b[3] >> 4 & 8),
+              b[0] & 0x7F,
+              b[1] & 0x7F,
+              b[2] & 0x7F,
+              b[3] & 0x7F]
     return output
 
 